@@ -1,51 +1,140 @@
 #!/usr/bin/env python3
 
 import argparse
+import codecs
 import hashlib
 import sys
 import os
 import glob
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 
-def generate_ntlm_hash(password):
-    """Generate NTLM hash from a password"""
-    # Convert password to UTF-16LE bytes
-    password_bytes = password.encode('utf-16le')
-    # Generate MD4 hash
-    ntlm_hash = hashlib.new('md4', password_bytes).hexdigest()
-    return ntlm_hash.lower()
+# Number of result lines buffered before each write to the output file
+WRITE_BATCH_SIZE = 65536
+
+# Maximum number of hash files read at the same time
+MAX_READ_WORKERS = 8
+
+# Direct UTF-16LE encoder, skips the codec lookup by name done by str.encode
+_utf16le_encode = codecs.utf_16_le_encode
+
+# Resolve the MD4 constructor once instead of looking it up by name per hash.
+# OpenSSL 3 drops MD4 from hashlib, so prefer pycryptodomex when installed.
+try:
+    from Cryptodome.Hash import MD4
+    _new_md4 = MD4.new
+except ImportError:
+    try:
+        _new_md4 = hashlib.new('md4').copy
+    except ValueError:
+        # No MD4 available at all, report it when a hash is actually generated
+        def _new_md4():
+            return hashlib.new('md4')
+
+def parse_hash(hash_part):
+    """Convert a 32 character hex hash to its 16 raw bytes, or None if invalid"""
+    if len(hash_part) != 32:
+        return None
+    try:
+        hash_bytes = bytes.fromhex(hash_part)
+    except ValueError:
+        return None
+    # bytes.fromhex skips whitespace, so also check the decoded length
+    return hash_bytes if len(hash_bytes) == 16 else None
+
+def generate_ntlm_hash_batch(passwords):
+    """Generate raw 16 byte NTLM digests for a list of passwords"""
+    new_md4 = _new_md4
+    encode = _utf16le_encode
+    digests = []
+    append = digests.append
+    for password in passwords:
+        md4 = new_md4()
+        md4.update(encode(password)[0])
+        append(md4.digest())
+    return digests
+
+def decode_password(raw):
+    """
+    Decode a wordlist line as UTF-8, falling back to Latin-1 (one character
+    per byte, like hashcat widens bytes for NTLM) so no byte is dropped
+    """
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
+
+def read_wordlist(filename):
+    """Read candidate passwords from a wordlist, one per line"""
+    try:
+        with open(filename, 'rb') as f:
+            passwords = [decode_password(line.rstrip(b'\r\n')) for line in f]
+    except FileNotFoundError:
+        print(f"Error: Wordlist '{filename}' not found", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading wordlist '{filename}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    return [password for password in passwords if password]
 
 def read_hashes_from_file(filename):
-    """Read NTLM hashes from file"""
+    """
+    Read NTLM hashes from file. Returns (hashes, warnings), the warning lines
+    are left to the caller to print so reads can run on several threads.
+    """
     hashes = []
+    warnings = []
     try:
         with open(filename, 'r') as f:
             for line in f:
                 line = line.strip()
                 if line and not line.startswith('#'):
                     # Extract hash (handle various formats)
-                    if ':' in line:
-                        # If in format username:hash or hash:other_data
-                        parts = line.split(':')
-                        hash_part = parts[1] if len(parts) > 1 else parts[0]
-                    else:
-                        hash_part = line
+                    # If in format username:hash or hash:other_data take the
+                    # second field, partition avoids building a list per line
+                    left, sep, right = line.partition(':')
+                    hash_part = right.partition(':')[0] if sep else left
                     
                     # Validate hash format (should be 32 hex characters)
-                    if len(hash_part) == 32 and all(c in '0123456789abcdefABCDEF' for c in hash_part):
-                        hashes.append((hash_part.lower(), line))  # (clean_hash, original_line)
+                    hash_bytes = parse_hash(hash_part)
+                    if hash_bytes is not None:
+                        hashes.append((hash_bytes, line))  # (raw_hash, original_line)
                     else:
-                        print(f"Warning: Skipping invalid hash format in {filename}: {line}", file=sys.stderr)
+                        warnings.append(f"Warning: Skipping invalid hash format in {filename}: {line}")
     except FileNotFoundError:
-        print(f"Error: File '{filename}' not found", file=sys.stderr)
+        warnings.append(f"Error: File '{filename}' not found")
     except Exception as e:
-        print(f"Error reading file '{filename}': {e}", file=sys.stderr)
+        warnings.append(f"Error reading file '{filename}': {e}")
     
-    return hashes
+    return hashes, warnings
+
+def find_files(file_pattern):
+    """Find files matching a glob pattern with a single directory scan"""
+    dirpath, pattern = os.path.split(file_pattern)
+    # Wildcards in the directory part still need a full glob
+    if not pattern or any(char in dirpath for char in '*?['):
+        return glob.glob(file_pattern)
+
+    # Like glob, '*' does not match hidden files unless asked for
+    include_hidden = pattern.startswith('.')
+    files = []
+    try:
+        with os.scandir(dirpath or '.') as entries:
+            for entry in entries:
+                if not include_hidden and entry.name.startswith('.'):
+                    continue
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                    files.append(os.path.join(dirpath, entry.name))
+    except OSError:
+        return []
+
+    return files
 
-def process_multiple_files(file_pattern, password, output_file, append_mode=False):
+def process_multiple_files(file_pattern, passwords, output_file, append_mode=False):
     """Process multiple hash files"""
     # Get all files matching the pattern
-    files = glob.glob(file_pattern)
+    files = find_files(file_pattern)
     
     if not files:
         print(f"Error: No files found matching pattern '{file_pattern}'", file=sys.stderr)
@@ -53,16 +142,27 @@ def process_multiple_files(file_pattern, password, output_file, append_mode=Fals
     
     print(f"Found {len(files)} files to process")
     
-    # Generate NTLM hash for the provided password
-    password_ntlm_hash = generate_ntlm_hash(password)
-    print(f"Generated NTLM hash for password '{password}': {password_ntlm_hash}")
+    if not passwords:
+        print("Error: No passwords to test", file=sys.stderr)
+        sys.exit(1)
+
+    # Generate NTLM hashes for the provided passwords
+    digests = generate_ntlm_hash_batch(passwords)
+    if len(passwords) == 1:
+        print(f"Generated NTLM hash for password '{passwords[0]}': {digests[0].hex()}")
+    else:
+        print(f"Generated NTLM hashes for {len(passwords)} passwords")
     
-    # Collect all hashes from all files
+    # Collect all hashes from all files, reading them in parallel so disk
+    # latency overlaps (map still returns results in file order, and warnings
+    # are printed here so they come out just like a serial read)
     all_hashes = []
-    for file_path in files:
-        print(f"Processing {file_path}...")
-        hashes = read_hashes_from_file(file_path)
-        all_hashes.extend(hashes)
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(files))) as executor:
+        for file_path, (hashes, warnings) in zip(files, executor.map(read_hashes_from_file, files)):
+            print(f"Processing {file_path}...")
+            for warning in warnings:
+                print(warning, file=sys.stderr)
+            all_hashes.extend(hashes)
     
     if not all_hashes:
         print("No valid hashes found in the input files", file=sys.stderr)
@@ -74,20 +174,31 @@ def process_multiple_files(file_pattern, password, output_file, append_mode=Fals
     write_mode = 'a' if append_mode else 'w'
     mode_text = "Appending to" if append_mode else "Writing to"
     
-    # Process each hash and write results
+    # Hashes from read_hashes_from_file are raw 16 byte digests, map each
+    # candidate digest back to its password (first one wins on duplicates)
+    targets = {}
+    for digest, password in zip(digests, passwords):
+        targets.setdefault(digest, password)
+
+    # Process each hash, write results and count matches in one pass
+    matches = 0
     try:
         with open(output_file, write_mode) as output:
-            for clean_hash, original_line in all_hashes:
-                if clean_hash.lower() == password_ntlm_hash.lower():
-                    result = f"{clean_hash}:{password}\n"
+            out_lines = []
+            for raw_hash, original_line in all_hashes:
+                password = targets.get(raw_hash)
+                if password is not None:
+                    matches += 1
+                    out_lines.append(f"{raw_hash.hex()}:{password}\n")
                 else:
-                    result = f"{clean_hash}:[not found]\n"
-                output.write(result)
-        
+                    out_lines.append(f"{raw_hash.hex()}:[not found]\n")
+                # Flush in batches to keep memory bounded on huge inputs
+                if len(out_lines) >= WRITE_BATCH_SIZE:
+                    output.writelines(out_lines)
+                    out_lines = []
+            output.writelines(out_lines)
+
         print(f"{mode_text} {output_file}")
-        
-        # Count matches
-        matches = sum(1 for clean_hash, _ in all_hashes if clean_hash.lower() == password_ntlm_hash.lower())
         print(f"Found {matches} matches out of {len(all_hashes)} hashes")
         
     except Exception as e:
@@ -97,13 +208,16 @@ def process_multiple_files(file_pattern, password, output_file, append_mode=Fals
 def main():
     parser = argparse.ArgumentParser(description='Recover NTLM hashes to plaintext passwords')
     parser.add_argument('-f', '--file', required=True, help='File pattern containing NTLM hashes (e.g., "temp_split/raw-hash-*")')
-    parser.add_argument('-p', '--password', required=True, help='Password to test against hashes')
+    passwords_group = parser.add_mutually_exclusive_group(required=True)
+    passwords_group.add_argument('-p', '--password', help='Password to test against hashes')
+    passwords_group.add_argument('-w', '--wordlist', help='File with one password per line to test against hashes')
     parser.add_argument('-o', '--output', required=True, help='Output file for results')
     parser.add_argument('-a', '--append', action='store_true', help='Append to output file instead of overwriting')
     
     args = parser.parse_args()
     
-    process_multiple_files(args.file, args.password, args.output, args.append)
+    passwords = read_wordlist(args.wordlist) if args.wordlist else [args.password]
+    process_multiple_files(args.file, passwords, args.output, args.append)
 
 if __name__ == "__main__":
     main()
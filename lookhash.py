@@ -2,15 +2,32 @@
 
 import os
 import argparse
+import dbm
 import requests
 import sys
 import time
 import re
 from datetime import datetime
+from itertools import islice
 
 # Base URL for the API
 API_BASE_URL = "https://ntlm.pw/api/lookup"
 
+# Default location of the cache of previously cracked hashes
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.lookhash.db")
+
+# Minimum number of seconds between bulk requests
+REQUEST_DELAY = 5
+
+# Shared session so every lookup reuses one keep-alive connection to the API
+_SESSION = requests.Session()
+_SESSION.headers.update({"Content-Type": "text/plain"})
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Patterns used to pull NT hashes out of dump files
+_NT_RE = re.compile(rb'(?:[^\s:]+\\)?[^\s:]+:\d+:[a-f0-9]{32}:([a-f0-9]{32}):::')
+_HEX_DIGITS = b'0123456789abcdef'
+
 def extract_nt_hashes(input_file, output_file):
     """Extract NT hashes from various hash formats"""
     print(f"[*] Extracting NT hashes from {input_file}...")
@@ -18,31 +35,28 @@ def extract_nt_hashes(input_file, output_file):
     nt_hashes = set()  # Use set to avoid duplicates
     
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
+        with open(input_file, 'rb') as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
                 
+                # Plain hash (32 chars hex) is the common case, check it first
+                # (deleting every hex digit leaves nothing behind)
+                if len(line) == 32 and not line.translate(None, _HEX_DIGITS):
+                    nt_hashes.add(line)
+                    continue
+
                 # Pattern for: username:rid:lmhash:nthash:::
                 # or: domain\username:rid:lmhash:nthash:::
-                pattern = r'(?:[^\s:]+\\)?[^\s:]+:\d+:[a-f0-9]{32}:([a-f0-9]{32}):::'
-                match = re.search(pattern, line)
-                
+                match = _NT_RE.search(line)
                 if match:
-                    nt_hash = match.group(1)
-                    nt_hashes.add(nt_hash)
-                    print(f"    [+] Extracted: {nt_hash}")
-                else:
-                    # If it's just a plain hash (32 chars hex)
-                    if re.match(r'^[a-f0-9]{32}$', line):
-                        nt_hashes.add(line)
-                        print(f"    [+] Added plain hash: {line}")
+                    nt_hashes.add(match.group(1))
         
         # Write unique hashes to output file
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with open(output_file, 'wb') as f:
             for nt_hash in sorted(nt_hashes):
-                f.write(nt_hash + '\n')
+                f.write(nt_hash + b'\n')
         
         print(f"[+] Extracted {len(nt_hashes)} unique NT hashes to {output_file}")
         return len(nt_hashes)
@@ -54,42 +68,19 @@ def extract_nt_hashes(input_file, output_file):
         print(f"[!] Error extracting hashes: {e}")
         sys.exit(1)
 
-def split_file(input_file, output_dir, lines_per_file=500):
-    """Split a large file into smaller chunks."""
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    total_lines = len(lines)
-    chunks = (total_lines + lines_per_file - 1) // lines_per_file
-
-    split_files = []
-    for i in range(chunks):
-        chunk_lines = lines[i * lines_per_file: (i + 1) * lines_per_file]
-        file_index = str(i + 1).zfill(2)
-        output_file = os.path.join(output_dir, f'raw-hash-{file_index}')
-        with open(output_file, 'w', encoding='utf-8') as out_f:
-            out_f.writelines(chunk_lines)
-        print(f"[+] Wrote {len(chunk_lines)} lines to {output_file}")
-        split_files.append(output_file)
-    
-    return split_files
-
 def single_lookup(hash_type, hash_value, output_file=None):
     """
     Perform a single hash lookup using the API.
     """
     url = f"{API_BASE_URL}/{hash_type}/{hash_value}"
     try:
-        response = requests.get(url)
+        response = _SESSION.get(url)
         # Handle HTTP 204 (No Content)
         if response.status_code == 204:
             result = f"{hash_value}:[not found]\n"
             print(result, end="")  # Print to terminal
             if output_file:
-                output_file.write(result)  # Write to file
+                output_file.write(result.encode())  # Write to file
             return
 
         # Process the plain text response
@@ -98,75 +89,165 @@ def single_lookup(hash_type, hash_value, output_file=None):
             for line in lines:
                 print(line)  # Print to terminal
                 if output_file:
-                    output_file.write(line + "\n")  # Write to file
+                    output_file.write(line.encode() + b"\n")  # Write to file
         else:
             error_message = f"Error: Unexpected status code {response.status_code}\n"
             print(error_message, file=sys.stderr)
             if output_file:
-                output_file.write(error_message)
+                output_file.write(error_message.encode())
 
     except requests.exceptions.RequestException as e:
         error_message = f"Error during single lookup: {e}\n"
         print(error_message, file=sys.stderr)
         if output_file:
-            output_file.write(error_message)
+            output_file.write(error_message.encode())
+
+_last_request = None
+
+def _wait_for_request_slot():
+    """Sleep until REQUEST_DELAY seconds have passed since the previous bulk request"""
+    global _last_request
+    if _last_request is not None:
+        # Time spent waiting on the previous response already counts towards the delay
+        remaining = REQUEST_DELAY - (time.monotonic() - _last_request)
+        if remaining > 0:
+            time.sleep(remaining)
+    _last_request = time.monotonic()
 
-def bulk_lookup(hash_type, file_path, output_file=None):
+def open_cache(path):
     """
-    Perform a bulk hash lookup using the API, sending 300 hashes per request with rate limit handling.
+    Open (creating if needed) the cache of previously cracked hashes.
+    Returns None if the cache can't be opened, lookups then always hit the API.
     """
     try:
-        with open(file_path, 'r') as file:
-            hashes = [line.strip() for line in file if line.strip()]
-
-        # Process hashes in chunks of 300
-        i = 0
-        while i < len(hashes):
-            chunk = hashes[i:i + 300]
-            url = f"{API_BASE_URL}?hashtype={hash_type}"
-            try:
-                response = requests.post(url, headers={"Content-Type": "text/plain"}, data="\n".join(chunk))
-
-                # Process the plain text response
-                if response.status_code == 200:
-                    lines = response.text.strip().split("\n")
-                    for line in lines:
-                        print(line)  # Print to terminal
-                        if output_file:
-                            output_file.write(line + "\n")  # Write to file
-                    i += 300  # Move to next chunk only on success
-                elif response.status_code == 429:
-                    # Rate limited - wait 15 minutes and retry same chunk
-                    error_message = f"[!] Rate limit hit (429). Waiting 15 minutes before retrying...\n"
-                    print(error_message, file=sys.stderr)
-                    if output_file:
-                        output_file.write(error_message)
-                    
-                    # Wait for 15 minutes (900 seconds)
-                    time.sleep(900)
-                    # Don't increment i, so we retry the same chunk
-                else:
-                    error_message = f"Error: Unexpected status code {response.status_code}\n"
-                    print(error_message, file=sys.stderr)
-                    if output_file:
-                        output_file.write(error_message)
-                    i += 300  # Move to next chunk even on other errors
-
-                # Introduce a 5-second delay between requests (unless we're retrying due to 429)
-                if response.status_code != 429:
-                    time.sleep(5)
-
-            except requests.exceptions.RequestException as e:
-                error_message = f"Error during bulk lookup: {e}\n"
-                print(error_message, file=sys.stderr)
-                if output_file:
-                    output_file.write(error_message)
-                i += 300  # Move to next chunk on network errors
+        # Owner-only, the cache holds cracked passwords in plaintext
+        return dbm.open(path, 'c', 0o600)
+    except dbm.error as e:
+        print(f"[!] Could not open cache '{path}', continuing without it: {e}", file=sys.stderr)
+        return None
+
+def _write_results(body, output_file=None):
+    """
+    Write a block of raw result lines to the terminal and the output file.
+    """
+    sys.stdout.flush()  # Keep ordering with earlier text output
+    sys.stdout.buffer.write(body)  # Print to terminal
+    sys.stdout.buffer.flush()
+    if output_file:
+        output_file.write(body)  # Write to file
+
+def _skip_cached(hashes, key_prefix, cache, cached_lines):
+    """
+    Yield only the hashes missing from the cache, collecting result lines for
+    the cached ones into cached_lines.
+    """
+    for hash_value in hashes:
+        password = cache.get(key_prefix + hash_value)
+        if password is None:
+            yield hash_value
+        else:
+            cached_lines.append(hash_value + b":" + password + b"\n")
+
+def _store_cracked(body, key_prefix, cache):
+    """
+    Remember every cracked hash:password line of an API response.
+    """
+    for line in body.splitlines():
+        hash_value, sep, password = line.partition(b":")
+        if sep and password and password != b"[not found]":
+            cache[key_prefix + hash_value] = password
+
+def bulk_lookup(hash_type, file_path, output_file=None, cache=None):
+    """
+    Perform a bulk hash lookup for every hash listed in file_path.
+    """
+    try:
+        # Hashes stay as bytes so the POST body never needs encoding
+        with open(file_path, 'rb') as file:
+            bulk_lookup_iter(hash_type, filter(None, (line.strip() for line in file)), output_file, cache)
     except FileNotFoundError:
         error_message = f"File not found: {file_path}\n"
         print(error_message, file=sys.stderr)
         if output_file:
-            output_file.write(error_message)
+            output_file.write(error_message.encode())
+
+def unique_hashes(hashes):
+    """
+    Yield each hash once, in first-seen order.
+    """
+    seen = set()
+    for hash_value in hashes:
+        if hash_value not in seen:
+            seen.add(hash_value)
+            yield hash_value
+
+def bulk_lookup_iter(hash_type, hashes, output_file=None, cache=None):
+    """
+    Perform a bulk hash lookup using the API, sending 300 hashes per request with rate limit handling.
+    Hashes can be any iterable of bytes and are consumed in chunks as they are needed.
+    If a cache is given, hashes cracked by an earlier run are answered from it
+    without being sent, and newly cracked hashes are added to it.
+    """
+    url = f"{API_BASE_URL}?hashtype={hash_type}"
+
+    # Drop duplicate hashes so each one is only sent once; the results are a
+    # hash:password map, so repeats add nothing
+    hashes = unique_hashes(hashes)
+
+    # Cache keys include the hash type, the same hex string can mean different things
+    key_prefix = hash_type.encode() + b":"
+    cached_lines = []
+    if cache is not None:
+        hashes = _skip_cached(hashes, key_prefix, cache, cached_lines)
+
+    # Process hashes in chunks of 300
+    chunk = list(islice(hashes, 300))
+    while chunk:
+        # Emit the cached answers collected while filling this chunk
+        if cached_lines:
+            _write_results(b"".join(cached_lines), output_file)
+            cached_lines.clear()
+
+        try:
+            _wait_for_request_slot()
+            response = _SESSION.post(url, data=b"\n".join(chunk))
+
+            # Process the plain text response
+            if response.status_code == 200:
+                # Write the raw response bytes at once rather than decoding
+                # and splitting it line by line
+                body = response.content.strip() + b"\n"
+                _write_results(body, output_file)
+                if cache is not None:
+                    _store_cracked(body, key_prefix, cache)
+                chunk = list(islice(hashes, 300))  # Move to next chunk only on success
+            elif response.status_code == 429:
+                # Rate limited - wait 15 minutes and retry same chunk
+                error_message = f"[!] Rate limit hit (429). Waiting 15 minutes before retrying...\n"
+                print(error_message, file=sys.stderr)
+                if output_file:
+                    output_file.write(error_message.encode())
+                
+                # Wait for 15 minutes (900 seconds)
+                time.sleep(900)
+                # Keep the current chunk, so we retry it
+            else:
+                error_message = f"Error: Unexpected status code {response.status_code}\n"
+                print(error_message, file=sys.stderr)
+                if output_file:
+                    output_file.write(error_message.encode())
+                chunk = list(islice(hashes, 300))  # Move to next chunk even on other errors
+
+        except requests.exceptions.RequestException as e:
+            error_message = f"Error during bulk lookup: {e}\n"
+            print(error_message, file=sys.stderr)
+            if output_file:
+                output_file.write(error_message.encode())
+            chunk = list(islice(hashes, 300))  # Move to next chunk on network errors
+
+    # Cached answers found after the last chunk was sent
+    if cached_lines:
+        _write_results(b"".join(cached_lines), output_file)
 
 def main():
     parser = argparse.ArgumentParser(description="Extract NT hashes and perform lookups using the ntlm.pw API.")
@@ -177,8 +258,11 @@ def main():
     )
     parser.add_argument("-f", "--file", required=True, help="Input file containing hashes to lookup")
     parser.add_argument("-o", "--output", help="Output file to save results")
-    parser.add_argument("--no-split", action="store_true", help="Skip file splitting and process directly")
+    # Lookups no longer split the file, the flag is kept so existing commands still work
+    parser.add_argument("--no-split", action="store_true", help=argparse.SUPPRESS)
     parser.add_argument("--extract-only", action="store_true", help="Only extract hashes, don't perform lookup")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help=f"Cache of previously cracked hashes (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the API, don't read or update the cache")
 
     args = parser.parse_args()
 
@@ -190,9 +274,11 @@ def main():
 
     # Open the output file if specified
     output_file = None
+    cache = None
     if args.output:
         try:
-            output_file = open(args.output, "w")
+            # Binary mode so API responses can be written without decoding
+            output_file = open(args.output, "wb")
         except IOError as e:
             print(f"Error opening output file: {e}", file=sys.stderr)
             sys.exit(1)
@@ -210,34 +296,22 @@ def main():
             print("[!] No NT hashes found in the input file")
             return
 
-        if args.no_split:
-            # Direct lookup without splitting
-            print("[*] Performing direct hash lookup...")
-            bulk_lookup(hash_type, extracted_file, output_file)
-        else:
-            # Split the file first, then process each chunk
-            print("[*] Splitting extracted hashes into chunks...")
-            split_files = split_file(extracted_file, "temp_split", 500)
-            
-            print("[*] Performing hash lookups...")
-            for split_file_path in split_files:
-                print(f"[*] Processing {split_file_path}...")
-                bulk_lookup(hash_type, split_file_path, output_file)
-            
-            # Clean up temporary files
-            print("[*] Cleaning up temporary files...")
-            for split_file_path in split_files:
-                os.remove(split_file_path)
-            os.rmdir("temp_split")
+        # Stream the extracted hashes straight into the lookup, no temp files needed
+        print("[*] Performing hash lookups...")
+        if not args.no_cache:
+            cache = open_cache(args.cache)
+        bulk_lookup(hash_type, extracted_file, output_file, cache)
         
         # Clean up extracted file
         if os.path.exists(extracted_file):
             os.remove(extracted_file)
             
     finally:
-        # Ensure the output file is closed if it was opened
+        # Ensure the output file and cache are closed if they were opened
         if output_file:
             output_file.close()
+        if cache is not None:
+            cache.close()
 
 if __name__ == "__main__":
     main()